@@ -0,0 +1,81 @@
+"""
+Admission control for the expensive endpoints.
+
+    @limit('stats', 2)          at most 2 requests run at once; others queue
+                                for up to QUEUE_TIMEOUT s, then get 503
+    @rate_limit('stats', 1, 5)  token bucket per session user_id: 1 req/s,
+                                bursts of 5, then 429
+    page_args()                 page / per_page from the query string,
+                                per_page capped at MAX_PER_PAGE
+
+Both 429 and 503 carry Retry-After. State is per process, like the rest
+of the app's in-memory state. Cheap endpoints are not decorated, so they
+keep responding while heavy ones queue. Set app.config['ADMISSION_ENABLED']
+to False to switch the limits off (the benchmark suite does).
+"""
+from flask import request, jsonify, session, current_app
+from functools import wraps
+import math, os, threading, time
+
+QUEUE_TIMEOUT = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 5))
+MAX_PER_PAGE  = int(os.environ.get('MAX_PER_PAGE', 100))
+
+_semaphores = {}
+_buckets    = {}
+_lock       = threading.Lock()
+
+def _error(msg, status, retry_after):
+    resp = jsonify({'error': msg})
+    resp.status_code = status
+    resp.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return resp
+
+def limit(name, max_concurrent, queue_timeout=None):
+    with _lock:
+        sem = _semaphores.setdefault(name, threading.BoundedSemaphore(max_concurrent))
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not current_app.config.get('ADMISSION_ENABLED', True):
+                return f(*args, **kwargs)
+            timeout = QUEUE_TIMEOUT if queue_timeout is None else queue_timeout
+            if not sem.acquire(timeout=timeout):
+                return _error('Server busy, try again shortly', 503, timeout)
+            try:
+                return f(*args, **kwargs)
+            finally:
+                sem.release()
+        return decorated
+    return decorator
+
+def take_token(key, rate, burst):
+    """Returns 0 if a token was taken, else seconds until one is available."""
+    now = time.monotonic()
+    with _lock:
+        tokens, last = _buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - last) * rate)
+        if tokens >= 1:
+            _buckets[key] = (tokens - 1, now)
+            return 0
+        _buckets[key] = (tokens, now)
+        return (1 - tokens) / rate
+
+def rate_limit(name, rate, burst):
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not current_app.config.get('ADMISSION_ENABLED', True):
+                return f(*args, **kwargs)
+            who  = session.get('user_id') or request.remote_addr
+            wait = take_token((name, who), rate, burst)
+            if wait:
+                return _error('Too many requests', 429, wait)
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+def page_args(default_per_page=20):
+    page     = max(1, int(request.args.get('page', 1)))
+    per_page = int(request.args.get('per_page', default_per_page))
+    return page, min(max(1, per_page), MAX_PER_PAGE)
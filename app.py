@@ -2,7 +2,7 @@ from flask import Flask, render_template, session, redirect, jsonify
 from flask_cors import CORS
 import os, hashlib, time
 from datetime import datetime
-import database
+import database, fast_json, compression, jobs, tasks, migrations
 
 from routes.auth     import auth_bp
 from routes.products import products_bp
@@ -12,11 +12,16 @@ from routes.dashboard import dashboard_bp
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'autoparts-secret-2024')
 CORS(app)
+fast_json.init_app(app)
+compression.init_app(app)
 
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'static', 'uploads')
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
+app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+app.config['COMPRESS_LEVEL']    = int(os.environ.get('COMPRESS_LEVEL', 5))
+app.config['ADMISSION_ENABLED'] = os.environ.get('ADMISSION_ENABLED', '1') != '0'
 
 # Print ALL env variables to find the right one
 print("=== ALL ENV VARS ===")
@@ -65,6 +70,15 @@ if db_connected and database.db is not None:
             print("Admin exists!")
     except Exception as e:
         print(f"Seed error: {e}")
+    migrations.run(database.db)
+
+# Background workers for slow side effects (see jobs.py / tasks.py)
+JOB_WORKERS     = int(os.environ.get('JOB_WORKERS', 2))
+JOB_WORKER_MODE = os.environ.get('JOB_WORKER_MODE', 'thread')   # thread | process
+if db_connected and JOB_WORKERS > 0:
+    job_pool = jobs.start_workers(JOB_WORKERS, mode=JOB_WORKER_MODE, uri=MONGO_URI)
+    jobs.enqueue('archive_orders', unique='archive_orders')
+    jobs.enqueue('recompute_forecast', unique='recompute_forecast')
 
 app.register_blueprint(auth_bp,       url_prefix='/api/auth')
 app.register_blueprint(products_bp,   url_prefix='/api/products')
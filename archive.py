@@ -0,0 +1,43 @@
+"""
+Hot/cold order tiers.
+
+`orders` holds recent orders; anything older than ORDER_ARCHIVE_DAYS is
+moved in batches to `orders_archive` by the archive_orders job. Because
+orders are only ever inserted with created_at = now, every archived order
+is older than every hot one - readers can page through the hot tier first
+and continue into the archive (see routes/orders.list_orders).
+
+Per-product totals live on the product (total_sold) and are not touched.
+"""
+from pymongo.errors import BulkWriteError
+from datetime import datetime, timedelta
+import database
+import os
+
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ORDER_ARCHIVE_DAYS', 365))
+BATCH_SIZE         = int(os.environ.get('ORDER_ARCHIVE_BATCH', 1000))
+RUN_EVERY          = 24 * 3600     # seconds between archive runs
+
+def archive_orders(older_than_days=None, batch_size=None):
+    # never below 7 days: the dashboard's 7-day order count reads the hot tier only
+    days   = max(7, older_than_days or ARCHIVE_AFTER_DAYS)
+    size   = batch_size or BATCH_SIZE
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    moved  = 0
+    while True:
+        batch = list(database.db.orders.find({'created_at': {'$lt': cutoff}})
+            .sort('created_at', 1)
+            .limit(size))
+        if not batch:
+            break
+        try:
+            database.db.orders_archive.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            # already copied by a run that died before its delete - fine
+            if any(err['code'] != 11000 for err in e.details.get('writeErrors', [])):
+                raise
+        database.db.orders.delete_many({'_id': {'$in': [o['_id'] for o in batch]}})
+        moved += len(batch)
+    if moved:
+        print(f"Archived {moved} orders older than {cutoff:%Y-%m-%d}")
+    return moved
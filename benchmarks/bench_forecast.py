@@ -0,0 +1,99 @@
+"""
+Benchmark for forecast.py at catalog scale.
+
+Compute only - synthetic arrays, no database:
+
+    python benchmarks/bench_forecast.py [--products 500000] [--rows 10000000] [--days 730]
+
+--rows is the number of (product, day) sales rows the Mongo $group would
+return for --days of history. Times the id mapping, the NumPy scoring and
+building the bulk_write operations.
+
+End to end - seeds a scratch database with datagen.py, then times
+forecast.run() including loading products, the sales aggregation and
+the bulk_write batches:
+
+    python benchmarks/bench_forecast.py --uri mongodb://localhost:27017/autoparts_bench \
+        --products 500000 --orders 5000000 [--no-seed]
+
+The database is emptied first unless --no-seed. Never point it at production.
+"""
+import argparse, os, sys, time
+import numpy as np
+from datetime import datetime
+from bson import ObjectId
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import database, forecast
+
+TARGET = 60     # seconds, for 500k products x 2 years of orders
+
+def timed(label, f, *args):
+    t = time.perf_counter()
+    out = f(*args)
+    print(f"  {label:<22} {time.perf_counter() - t:8.2f} s")
+    return out
+
+def compute_only(args):
+    rng = np.random.default_rng(1)
+
+    print(f"{args.products:,} products, {args.rows:,} sales rows over {args.days} days")
+    oids = [ObjectId() for _ in range(args.products)]
+    ids  = np.array([o.binary for o in oids], dtype='S12')
+    qty  = rng.integers(0, 20, args.products).astype(np.float64)
+    lead = np.full(args.products, forecast.LEAD_TIME_DAYS)
+
+    # skewed demand: a few parts sell daily, most rarely
+    popular    = rng.zipf(1.3, args.rows) % args.products
+    order_pids = ids[rng.permutation(args.products)[popular]]
+    ages       = rng.integers(0, args.days, args.rows)
+    qtys       = rng.integers(1, 4, args.rows).astype(np.float64)
+
+    start = time.perf_counter()
+    idx, found = timed('map ids', forecast._index, ids, order_pids)
+    r = timed('compute', forecast.compute, lead, idx[found], ages[found], qtys[found])
+    ops = timed('build bulk_write ops', forecast._updates, oids, r,
+                np.zeros(args.products, dtype=bool), datetime.utcnow())
+    print(f"  {'total':<22} {time.perf_counter() - start:8.2f} s   ({len(ops):,} products to write)")
+    # what the reorder report would flag with these quantities
+    reorder = (r['velocity'] > 0) & (qty <= r['reorder_point'])
+    print(f"  {int(reorder.sum()):,} flagged for reorder")
+
+def end_to_end(db, args):
+    import datagen
+    if not args.no_seed:
+        print(f"Seeding {args.products:,} products, {args.orders:,} orders over {args.days} days...")
+        t = time.perf_counter()
+        datagen.seed(db, args.products, args.orders, args.days)
+        print(f"  seeded in {time.perf_counter() - t:.1f} s")
+
+    timings = {}
+    start = time.perf_counter()
+    written = forecast.run(timings)
+    total = time.perf_counter() - start
+    for phase, secs in timings.items():
+        print(f"  {phase:<22} {secs:8.2f} s")
+    verdict = 'within' if total <= TARGET else 'OVER'
+    print(f"  {'total':<22} {total:8.2f} s   ({written:,} products written; "
+          f"{verdict} the {TARGET} s target)")
+    return total
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--products', type=int, default=500_000)
+    ap.add_argument('--rows', type=int, default=10_000_000)
+    ap.add_argument('--days', type=int, default=730)
+    ap.add_argument('--uri', help='run end to end against this scratch database')
+    ap.add_argument('--orders', type=int, default=5_000_000)
+    ap.add_argument('--no-seed', action='store_true')
+    args = ap.parse_args()
+
+    if args.uri:
+        database.init_db(args.uri)
+        end_to_end(database.db, args)
+    else:
+        compute_only(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Micro-benchmark: encode time and wire size of the two biggest API payloads,
+/api/products/search and /api/dashboard/stats.
+
+    python benchmarks/bench_payloads.py [--per-page 20] [--rounds 2000]
+
+Compares Flask's stdlib provider (old path: .isoformat() per field, sorted
+keys) with fast_json.FastJSONProvider, then gzip / brotli sizes.
+"""
+import argparse, os, sys, timeit
+from datetime import datetime
+from bson import ObjectId
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+import fast_json, compression
+from routes.products import serialize as serialize_product
+import datagen
+
+def search_payload(per_page):
+    items = datagen.products(per_page)
+    return {'success': True, 'products': [serialize_product(p, include_links=False) for p in items],
+            'total': 5000, 'page': 1, 'pages': -(-5000 // per_page)}
+
+def stats_payload():
+    ps = datagen.products(25)
+    return {
+        'success': True,
+        'stats': {'total_products': 5000, 'total_orders': 42000, 'out_of_stock': 120,
+                  'low_stock': 340, 'total_value': 183422.5, 'recent_orders_7d': 410},
+        'recent_products': [{'_id': str(p['_id']), 'title': p['title'], 'part_name': p['part_name'],
+                             'quantity': p['quantity'], 'price': p['price'], 'image': p['images'][0],
+                             'link_count': 1} for p in ps[:5]],
+        'low_stock_list': [{'_id': str(p['_id']), 'title': p['title'], 'quantity': p['quantity'],
+                            'low_stock_threshold': 3, 'image': p['images'][0]} for p in ps[5:15]],
+        'out_of_stock_list': [{'_id': str(p['_id']), 'title': p['title'],
+                               'image': p['images'][0]} for p in ps[15:25]],
+        'recent_orders': [{'_id': str(ObjectId()), 'product_title': p['title'],
+                           'product_image': p['images'][0], 'quantity_sold': 1,
+                           'sale_price': p['price'], 'account': 'PMC',
+                           'created_at': p['created_at']} for p in ps[:5]],
+    }
+
+def legacy(obj):
+    # what the routes used to hand to the stdlib provider: datetimes pre-stringified
+    if isinstance(obj, dict):
+        return {k: legacy(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [legacy(v) for v in obj]
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return obj
+
+def run(name, payload, rounds, level):
+    app = Flask('bench')
+    stdlib = DefaultJSONProvider(app)
+    fast = fast_json.FastJSONProvider(app)
+    old = legacy(payload)
+
+    with app.app_context():
+        t_old  = timeit.timeit(lambda: stdlib.response(old).get_data(), number=rounds)
+        t_fast = timeit.timeit(lambda: fast.response(payload).get_data(), number=rounds)
+        raw = fast.response(payload).get_data()
+        old_raw = stdlib.response(old).get_data()
+
+    print(f"\n{name}")
+    print(f"  encode  stdlib   {t_old / rounds * 1e6:9.1f} us/op")
+    print(f"  encode  {'orjson ' if fast_json.orjson else 'stdlib*'}  {t_fast / rounds * 1e6:9.1f} us/op"
+          f"   ({t_old / t_fast:.1f}x)")
+    print(f"  size    raw      {len(old_raw):9d} B (old)  {len(raw):9d} B (new)")
+    for coding in ('gzip', 'br'):
+        if coding == 'br' and compression.brotli is None:
+            print("  size    br       (brotli not installed)")
+            continue
+        t = timeit.timeit(lambda: compression.compress(raw, coding, level), number=max(1, rounds // 10))
+        print(f"  size    {coding:<8} {len(compression.compress(raw, coding, level)):9d} B"
+              f"   +{t / max(1, rounds // 10) * 1e6:.1f} us/op")
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--per-page', type=int, default=20)
+    ap.add_argument('--rounds', type=int, default=2000)
+    ap.add_argument('--level', type=int, default=5)
+    args = ap.parse_args()
+    run(f"/api/products/search (per_page={args.per_page})", search_payload(args.per_page),
+        args.rounds, args.level)
+    run("/api/dashboard/stats", stats_payload(), args.rounds, args.level)
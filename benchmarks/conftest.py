@@ -0,0 +1,76 @@
+"""
+Fixtures for the pytest-benchmark suite.
+
+    pip install -r benchmarks/requirements.txt
+    pytest benchmarks --benchmark-autosave --benchmark-storage=benchmarks/baselines
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:20% \
+        --benchmark-storage=benchmarks/baselines
+
+Runs against mongomock by default. Set BENCH_MONGO_URI to a scratch
+database on a local mongod for realistic numbers (it is wiped and seeded).
+BENCH_PRODUCTS / BENCH_ORDERS control the catalog size.
+"""
+import os, sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import database, datagen
+
+N_PRODUCTS = int(os.environ.get('BENCH_PRODUCTS', 2000))
+N_ORDERS   = int(os.environ.get('BENCH_ORDERS', 20000))
+
+@pytest.fixture(scope='session')
+def db():
+    uri = os.environ.get('BENCH_MONGO_URI')
+    if uri:
+        database.init_db(uri)
+    else:
+        import mongomock
+        database.db = mongomock.MongoClient().autoparts_bench
+        database._create_indexes()
+    datagen.seed(database.db, N_PRODUCTS, N_ORDERS)
+    return database.db
+
+@pytest.fixture(scope='session')
+def real_mongo(db):
+    # $text search and the order -> product $lookup sub-pipeline need a real server
+    if not os.environ.get('BENCH_MONGO_URI'):
+        pytest.skip('needs BENCH_MONGO_URI')
+
+@pytest.fixture(scope='session')
+def app(db):
+    from flask import Flask
+    import fast_json, compression
+    from routes.auth      import auth_bp
+    from routes.products  import products_bp
+    from routes.orders    import orders_bp
+    from routes.dashboard import dashboard_bp
+
+    app = Flask('bench', root_path=ROOT)
+    app.secret_key = 'bench'
+    app.config['UPLOAD_FOLDER'] = os.path.join(ROOT, 'static', 'uploads')
+    app.config['ADMISSION_ENABLED'] = False     # measure the handlers, not the limits
+    fast_json.init_app(app)
+    compression.init_app(app)
+    app.register_blueprint(auth_bp,       url_prefix='/api/auth')
+    app.register_blueprint(products_bp,   url_prefix='/api/products')
+    app.register_blueprint(orders_bp,     url_prefix='/api/orders')
+    app.register_blueprint(dashboard_bp,  url_prefix='/api/dashboard')
+    return app
+
+@pytest.fixture
+def client(app):
+    c = app.test_client()
+    with c.session_transaction() as s:
+        s['user_id'] = 'bench'
+        s['name']    = 'Bench'
+        s['role']    = 'admin'
+    return c
+
+@pytest.fixture(scope='session')
+def product(db):
+    # the best seller, so its order history is the longest
+    return db.products.find_one(sort=[('total_sold', -1)])
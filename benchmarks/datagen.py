@@ -0,0 +1,164 @@
+"""
+Synthetic catalog generator.
+
+Products look like the real ones: make/model/year fitment, part names with
+side and colour, OEM-style part numbers, eBay links on the PMC / Powergen
+accounts. Orders follow a skewed popularity curve over `days` of history.
+
+    python benchmarks/datagen.py --uri mongodb://localhost:27017/autoparts_bench \
+        --products 20000 --orders 200000 --days 730
+
+Writes go to the given database, which is emptied first (products, orders,
+orders_archive, stats_cache). Never point it at production.
+"""
+import argparse, os, random, sys
+from collections import defaultdict
+from itertools import accumulate
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import UpdateOne
+
+FITMENT = {
+    'Toyota':     ['Corolla', 'Yaris', 'RAV4', 'Auris', 'Prius', 'Hilux'],
+    'Honda':      ['Civic', 'Jazz', 'CR-V', 'Accord'],
+    'Ford':       ['Fiesta', 'Focus', 'Transit', 'Kuga', 'Mondeo'],
+    'Volkswagen': ['Golf', 'Polo', 'Passat', 'Tiguan', 'Transporter'],
+    'BMW':        ['1 Series', '3 Series', '5 Series', 'X3', 'X5'],
+    'Mercedes':   ['A-Class', 'C-Class', 'E-Class', 'Sprinter', 'Vito'],
+    'Nissan':     ['Qashqai', 'Micra', 'Juke', 'Navara'],
+    'Vauxhall':   ['Corsa', 'Astra', 'Insignia', 'Vivaro'],
+    'Audi':       ['A3', 'A4', 'A6', 'Q5'],
+    'Peugeot':    ['208', '308', '3008', 'Partner'],
+}
+PARTS = {
+    'Headlight':        ('HL', True),
+    'Tail Light':       ('TL', True),
+    'Wing Mirror':      ('WM', True),
+    'Door Handle':      ('DH', True),
+    'Fog Light':        ('FL', True),
+    'Front Bumper':     ('FB', False),
+    'Rear Bumper':      ('RB', False),
+    'Grille':           ('GR', False),
+    'Bonnet':           ('BN', False),
+    'Radiator':         ('RD', False),
+    'ECU':              ('EC', False),
+    'Alternator':       ('AL', False),
+    'Window Regulator': ('WR', True),
+    'Wiper Motor':      ('WP', False),
+}
+COLORS   = ['Black', 'Silver', 'White', 'Grey', 'Blue', 'Red', '']
+ACCOUNTS = ['PMC', 'Powergen']
+TAGS     = ['oem', 'genuine', 'used', 'tested', 'facelift', 'pre-facelift', 'led', 'xenon']
+
+def product(rng, now=None):
+    now   = now or datetime.utcnow()
+    make  = rng.choice(list(FITMENT))
+    model = rng.choice(FITMENT[make])
+    part  = rng.choice(list(PARTS))
+    code, sided = PARTS[part]
+    side  = rng.choice(['Left', 'Right']) if sided else ''
+    start = rng.randint(2005, 2020)
+    years = f"{start}-{start + rng.randint(1, 6)}"
+    color = rng.choice(COLORS)
+    created = now - timedelta(days=rng.uniform(0, 730))
+    links = [{
+        'url':      f"https://www.ebay.co.uk/itm/{rng.randint(10**11, 10**12 - 1)}",
+        'account':  rng.choice(ACCOUNTS),
+        'label':    '',
+        'added_at': created.isoformat(),
+    } for _ in range(rng.choice([1, 1, 1, 2, 3]))]
+    title = ' '.join(x for x in [make, model, years, side, part, color] if x)
+    return {
+        '_id':          ObjectId(),
+        'title':        title,
+        'part_name':    part,
+        'part_number':  f"{make[:2].upper()}{code}-{rng.randint(1000, 99999)}-{rng.choice('ABCDEFG')}",
+        'side':         side,
+        'color':        color,
+        'tags':         rng.sample(TAGS, rng.randint(0, 3)),
+        'car_make':     make,
+        'car_model':    model,
+        'car_year':     years,
+        'description':  f"{part} for {make} {model} {years}. Used, tested and in good working order.",
+        'price':        round(rng.uniform(8, 450), 2),
+        'shipping':     rng.choice([0, 4.99, 9.99, 14.99]),
+        'quantity':     rng.choice([0, 1, 1, 2, 3, 5, 8, 12]),
+        'low_stock_threshold': 3,
+        'location_text': f"Shelf {rng.choice('ABCDEFGH')}{rng.randint(1, 20)}",
+        'images':       [f"/static/uploads/{ObjectId()}.webp" for _ in range(rng.randint(1, 4))],
+        'location_images': [],
+        'ebay_links':   links,
+        'total_sold':   0,
+        'created_at':   created,
+        'updated_at':   created,
+        'created_by':   '',
+    }
+
+def products(n, seed=1):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    return [product(rng, now) for _ in range(n)]
+
+def popularity(n):
+    """Cumulative weights for orders(): a small share of parts gets most sales."""
+    return list(accumulate(1 / (i + 1) ** 0.8 for i in range(n)))
+
+def orders(prods, n, days=730, seed=2, cum_weights=None):
+    """Orders against `prods` (dicts with at least _id and price)."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    out = []
+    for p in rng.choices(prods, cum_weights=cum_weights or popularity(len(prods)), k=n):
+        out.append({
+            'product_id':    p['_id'],
+            'quantity_sold': rng.choice([1, 1, 1, 1, 2, 3]),
+            'sale_price':    p['price'],
+            'account':       rng.choice(ACCOUNTS),
+            'ebay_order_id': f"{rng.randint(10, 99)}-{rng.randint(10000, 99999)}-{rng.randint(10000, 99999)}",
+            'buyer_name':    '',
+            'note':          '',
+            'added_by':      'Admin',
+            'created_at':    now - timedelta(days=rng.uniform(0, days)),
+        })
+    return out
+
+def seed(db, n_products, n_orders, days=730, batch=5000):
+    """
+    Empty the catalog collections and insert fresh data, batch by batch so
+    catalogs of hundreds of thousands of products fit in memory. Returns
+    [{_id, price}] for the products.
+    """
+    for coll in ('products', 'orders', 'orders_archive', 'stats_cache'):
+        db[coll].delete_many({})
+    rng, now = random.Random(1), datetime.utcnow()
+    prods = []
+    for i in range(0, n_products, batch):
+        docs = [product(rng, now) for _ in range(min(batch, n_products - i))]
+        db.products.insert_many(docs)
+        prods += [{'_id': d['_id'], 'price': d['price']} for d in docs]
+
+    cum_weights = popularity(len(prods))
+    sold = defaultdict(int)
+    for i in range(0, n_orders, batch):
+        ords = orders(prods, min(batch, n_orders - i), days, seed=2 + i, cum_weights=cum_weights)
+        db.orders.insert_many(ords)
+        for o in ords:
+            sold[o['product_id']] += o['quantity_sold']
+    ops = [UpdateOne({'_id': pid}, {'$set': {'total_sold': q}}) for pid, q in sold.items()]
+    for i in range(0, len(ops), batch):
+        db.products.bulk_write(ops[i:i + batch], ordered=False)
+    return prods
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--uri', required=True)
+    ap.add_argument('--products', type=int, default=5000)
+    ap.add_argument('--orders', type=int, default=50000)
+    ap.add_argument('--days', type=int, default=730)
+    args = ap.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import database
+    database.init_db(args.uri)
+    seed(database.db, args.products, args.orders, args.days)
+    print(f"Seeded {args.products} products, {args.orders} orders")
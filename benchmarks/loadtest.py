@@ -0,0 +1,188 @@
+"""
+HTTP load test against a running server, replaying what the pages do:
+
+    dashboard       GET /  then  /api/dashboard/stats
+    products        GET /products, search pages, text search, quantity edit
+    product detail  GET /products/<id>, /api/products/<id>, its order history,
+                    add an order and delete it again (with --writes)
+
+    python benchmarks/loadtest.py --host http://localhost:5000 --users 20 --duration 60
+    python benchmarks/loadtest.py ... --save-baseline benchmarks/baselines/load.json
+    python benchmarks/loadtest.py ... --compare benchmarks/baselines/load.json --tolerance 0.25
+
+Prints count / errors / p50 / p95 / p99 per endpoint. --compare exits 1
+when any endpoint's p95 is more than `tolerance` slower than the baseline.
+Seed a scratch database with datagen.py first; --writes modifies data.
+All virtual users share one login, so the per-user rate limits in
+admission.py apply to them together - 429/503 responses show up as
+errors. Start the server with ADMISSION_ENABLED=0 to measure raw capacity.
+"""
+import argparse, gzip, http.cookiejar, json, os, random, sys, threading, time
+import urllib.error, urllib.parse, urllib.request
+from collections import defaultdict
+
+QUERIES = ['headlight', 'corolla', 'golf mirror', 'bmw 3 series', 'tail light left', 'ecu', 'grille']
+
+class User:
+    def __init__(self, host, stats, lock):
+        self.host  = host.rstrip('/')
+        self.stats = stats
+        self.lock  = lock
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+    def call(self, name, path, method='GET', body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.host + path, data=data, method=method, headers={
+            'Content-Type': 'application/json', 'Accept-Encoding': 'gzip'})
+        start = time.perf_counter()
+        ok, payload = True, b''
+        try:
+            with self.opener.open(req, timeout=30) as r:
+                payload = r.read()
+                if r.headers.get('Content-Encoding') == 'gzip':
+                    payload = gzip.decompress(payload)
+        except (urllib.error.URLError, OSError):
+            ok = False
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.stats[name]['times'].append(elapsed)
+            if not ok:
+                self.stats[name]['errors'] += 1
+        if ok and payload[:1] == b'{':
+            return json.loads(payload)
+        return None
+
+    def login(self, email, password):
+        r = self.call('POST /api/auth/login', '/api/auth/login', 'POST',
+                      {'email': email, 'password': password})
+        if not r or not r.get('success'):
+            raise SystemExit('login failed - check --email / --password')
+
+    # ─── flows ───────────────────────────────────────────────────────────────
+    def dashboard(self, ctx):
+        self.call('GET /', '/')
+        self.call('GET /api/dashboard/stats', '/api/dashboard/stats')
+
+    def products(self, ctx):
+        self.call('GET /products', '/products')
+        page = random.randint(1, ctx['pages'])
+        r = self.call('GET /api/products/search (list)',
+                      f"/api/products/search?q=&page={page}&per_page=20")
+        q = urllib.parse.quote(random.choice(QUERIES))
+        self.call('GET /api/products/search (text)', f"/api/products/search?q={q}&page=1&per_page=20")
+        if ctx['writes'] and r and r.get('products'):
+            p = random.choice(r['products'])
+            self.call('PUT /api/products/[id]/quantity', f"/api/products/{p['_id']}/quantity",
+                      'PUT', {'quantity': p['quantity']})
+
+    def product_detail(self, ctx):
+        pid = random.choice(ctx['product_ids'])
+        self.call('GET /products/[id]', f"/products/{pid}")
+        self.call('GET /api/products/[id]', f"/api/products/{pid}")
+        self.call('GET /api/orders/list (product)', f"/api/orders/list?archived=1&product_id={pid}")
+        if ctx['writes']:
+            r = self.call('POST /api/orders/add', '/api/orders/add', 'POST',
+                          {'product_id': pid, 'quantity_sold': 1, 'account': 'PMC'})
+            if r and r.get('order_id'):
+                self.call('DELETE /api/orders/[id]', f"/api/orders/{r['order_id']}", 'DELETE')
+
+FLOWS = [('product_detail', 5), ('products', 4), ('dashboard', 1)]
+
+def percentile(sorted_times, p):
+    if not sorted_times:
+        return 0.0
+    k = min(len(sorted_times) - 1, int(round(p / 100 * (len(sorted_times) - 1))))
+    return sorted_times[k]
+
+def summarize(stats, duration):
+    out = {}
+    for name, s in sorted(stats.items()):
+        t = sorted(s['times'])
+        out[name] = {
+            'count':  len(t),
+            'errors': s['errors'],
+            'rps':    round(len(t) / duration, 2),
+            'p50':    round(percentile(t, 50) * 1000, 2),
+            'p95':    round(percentile(t, 95) * 1000, 2),
+            'p99':    round(percentile(t, 99) * 1000, 2),
+        }
+    return out
+
+def print_report(report, baseline=None):
+    print(f"\n{'endpoint':<38}{'count':>7}{'err':>5}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          + ('   p95 vs base' if baseline else ''))
+    for name, r in report.items():
+        line = (f"{name:<38}{r['count']:>7}{r['errors']:>5}{r['rps']:>8}"
+                f"{r['p50']:>9}{r['p95']:>9}{r['p99']:>9}")
+        if baseline and name in baseline and baseline[name]['p95']:
+            line += f"   {r['p95'] / baseline[name]['p95'] - 1:+.0%}"
+        print(line)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--host', default='http://localhost:5000')
+    ap.add_argument('--users', type=int, default=10)
+    ap.add_argument('--duration', type=float, default=30, help='seconds')
+    ap.add_argument('--think', type=float, default=0.5, help='max seconds between flows')
+    ap.add_argument('--email', default='admin@autoparts.com')
+    ap.add_argument('--password', default='admin123')
+    ap.add_argument('--writes', action='store_true', help='include order add/delete and quantity edits')
+    ap.add_argument('--save-baseline')
+    ap.add_argument('--compare')
+    ap.add_argument('--tolerance', type=float, default=0.25)
+    args = ap.parse_args()
+
+    stats = defaultdict(lambda: {'times': [], 'errors': 0})
+    lock  = threading.Lock()
+
+    probe = User(args.host, defaultdict(lambda: {'times': [], 'errors': 0}), threading.Lock())
+    probe.login(args.email, args.password)
+    first = probe.call('search', '/api/products/search?q=&page=1&per_page=100') or {}
+    ctx = {
+        'product_ids': [p['_id'] for p in first.get('products', [])],
+        'pages':       max(1, min(first.get('total', 0) // 20, 200)),
+        'writes':      args.writes,
+    }
+    if not ctx['product_ids']:
+        raise SystemExit('no products - seed the database with benchmarks/datagen.py')
+
+    names, weights = zip(*FLOWS)
+    deadline = time.time() + args.duration
+
+    def run_user():
+        u = User(args.host, stats, lock)
+        u.login(args.email, args.password)
+        while time.time() < deadline:
+            getattr(u, random.choices(names, weights)[0])(ctx)
+            time.sleep(random.uniform(0, args.think))
+
+    threads = [threading.Thread(target=run_user, daemon=True) for _ in range(args.users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    report   = summarize(stats, args.duration)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['endpoints']
+    print_report(report, baseline)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.save_baseline) or '.', exist_ok=True)
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'users': args.users, 'duration': args.duration, 'writes': args.writes,
+                       'endpoints': report}, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if baseline:
+        slower = [n for n, r in report.items()
+                  if n in baseline and baseline[n]['p95'] and r['p95'] > baseline[n]['p95'] * (1 + args.tolerance)]
+        if slower:
+            print(f"\nRegressed beyond {args.tolerance:.0%} at p95: {', '.join(slower)}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
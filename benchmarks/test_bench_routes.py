@@ -0,0 +1,43 @@
+"""
+Route handlers through the Flask test client - the same calls the
+templates make (products.html, product_detail.html, dashboard.html).
+"""
+import database
+
+def ok(r):
+    assert r.status_code == 200, r.data[:200]
+    return r
+
+def test_search_list(benchmark, client):
+    benchmark(lambda: ok(client.get('/api/products/search?q=&page=1&per_page=20')))
+
+def test_search_deep_page(benchmark, client):
+    benchmark(lambda: ok(client.get('/api/products/search?q=&page=50&per_page=20')))
+
+def test_search_text(benchmark, client, real_mongo):
+    benchmark(lambda: ok(client.get('/api/products/search?q=corolla%20headlight&page=1&per_page=20')))
+
+def test_get_product(benchmark, client, product):
+    benchmark(lambda: ok(client.get(f"/api/products/{product['_id']}")))
+
+def test_product_orders(benchmark, client, product, real_mongo):
+    benchmark(lambda: ok(client.get(f"/api/orders/list?product_id={product['_id']}")))
+
+def test_orders_list(benchmark, client, real_mongo):
+    benchmark(lambda: ok(client.get('/api/orders/list?page=1&per_page=20')))
+
+def test_dashboard_stats_cached(benchmark, client, real_mongo):
+    benchmark(lambda: ok(client.get('/api/dashboard/stats')))
+
+def test_dashboard_stats_cold(benchmark, client, real_mongo):
+    def run():
+        database.db.stats_cache.delete_many({})
+        ok(client.get('/api/dashboard/stats'))
+    benchmark(run)
+
+def test_add_and_delete_order(benchmark, client, product):
+    # paired so stock and totals end where they started
+    def run():
+        r = ok(client.post('/api/orders/add', json={'product_id': str(product['_id']), 'quantity_sold': 1}))
+        ok(client.delete(f"/api/orders/{r.get_json()['order_id']}"))
+    benchmark(run)
@@ -0,0 +1,34 @@
+import pytest
+from flask import Flask
+import datagen, fast_json
+from routes.products import serialize as serialize_product
+from routes.orders import serialize as serialize_order
+
+@pytest.fixture(scope='module')
+def products():
+    return datagen.products(20)
+
+@pytest.fixture(scope='module')
+def orders(products):
+    ords = datagen.orders(products, 20)
+    for o in ords:
+        o['_id'] = o['product_id']
+        o['product'] = [next(p for p in products if p['_id'] == o['product_id'])]
+    return ords
+
+def test_serialize_product(benchmark, products):
+    benchmark(lambda: [serialize_product(p) for p in products])
+
+def test_serialize_product_list(benchmark, products):
+    benchmark(lambda: [serialize_product(p, include_links=False) for p in products])
+
+def test_serialize_order(benchmark, orders):
+    benchmark(lambda: [serialize_order(o) for o in orders])
+
+def test_encode_search_page(benchmark, products):
+    app = Flask('bench')
+    provider = fast_json.FastJSONProvider(app)
+    payload = {'success': True, 'products': [serialize_product(p, include_links=False) for p in products],
+               'total': 5000, 'page': 1, 'pages': 250}
+    with app.app_context():
+        benchmark(lambda: provider.response(payload).get_data())
@@ -0,0 +1,70 @@
+from flask import request
+import gzip
+
+try:
+    import brotli
+except ImportError:          # gzip only
+    brotli = None
+
+COMPRESSIBLE = {'application/json', 'text/html', 'text/css', 'text/plain',
+                'application/javascript', 'text/javascript'}
+
+def _accepted(header):
+    """
+    Parse Accept-Encoding into {coding: q}.
+    'gzip, br;q=0.8, *;q=0' -> {'gzip': 1.0, 'br': 0.8, '*': 0.0}
+    """
+    out = {}
+    for part in (header or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        coding, _, params = part.partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try: q = float(params[2:])
+            except ValueError: q = 0.0
+        out[coding.strip().lower()] = q
+    return out
+
+def choose_encoding(header):
+    accepted = _accepted(header)
+    wildcard = accepted.get('*', 0.0)
+    # brotli first: ~15-25% smaller than gzip on our JSON payloads
+    for coding in (('br', 'gzip') if brotli is not None else ('gzip',)):
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+def compress(data, coding, level):
+    if coding == 'br':
+        return brotli.compress(data, quality=min(level, 11))
+    return gzip.compress(data, compresslevel=min(level, 9), mtime=0)
+
+def init_app(app):
+    app.config.setdefault('COMPRESS_MIN_SIZE', 1024)    # bytes; smaller bodies aren't worth it
+    app.config.setdefault('COMPRESS_LEVEL', 5)          # gzip 1-9 / brotli 0-11
+
+    @app.after_request
+    def compress_response(resp):
+        resp.vary.add('Accept-Encoding')
+        if (resp.direct_passthrough or resp.is_streamed
+                or not (200 <= resp.status_code < 300)
+                or 'Content-Encoding' in resp.headers
+                or resp.mimetype not in COMPRESSIBLE):
+            return resp
+
+        data = resp.get_data()
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return resp
+
+        coding = choose_encoding(request.headers.get('Accept-Encoding'))
+        if not coding:
+            return resp
+
+        resp.set_data(compress(data, coding, app.config['COMPRESS_LEVEL']))
+        resp.headers['Content-Encoding'] = coding
+        return resp
+
+    return compress_response
@@ -35,9 +35,20 @@ def _create_indexes():
         pass
     try:
         db.products.create_index('created_at')
-        db.orders.create_index('product_id')
+        db.products.create_index('forecast.velocity')
+        db.orders.create_index([('product_id', 1), ('created_at', -1)])
         db.orders.create_index('created_at')
+        db.orders_archive.create_index([('product_id', 1), ('created_at', -1)])
+        db.orders_archive.create_index('created_at')
         db.users.create_index('email', unique=True)
     except:
         pass
+    try:
+        db.jobs.create_index([('status', 1), ('run_at', 1)])
+        db.jobs.create_index('unique', unique=True,
+                             partialFilterExpression={'status': 'queued',
+                                                      'unique': {'$exists': True}})
+        db.jobs.create_index('finished_at', expireAfterSeconds=7 * 24 * 3600)
+    except:
+        pass
     print("Indexes ready")
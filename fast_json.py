@@ -0,0 +1,61 @@
+from flask.json.provider import DefaultJSONProvider
+from bson import ObjectId
+from datetime import datetime, date
+import json
+
+try:
+    import orjson
+except ImportError:          # stdlib fallback
+    orjson = None
+
+def _default(o):
+    # Mongo types that show up in documents / serialize() output
+    if isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider for the API blueprints.
+    Uses orjson when installed, stdlib json otherwise. Both encode
+    ObjectId as str and datetime as ISO-8601, so routes can hand raw
+    values to jsonify() without converting field by field.
+    """
+    default     = staticmethod(_default)
+    ensure_ascii = False
+    sort_keys   = False     # keep serialize() field order, skip the sort
+
+    def _orjson_opts(self, indent=None, sort_keys=None):
+        opts = orjson.OPT_NON_STR_KEYS
+        if indent:
+            opts |= orjson.OPT_INDENT_2
+        if sort_keys if sort_keys is not None else self.sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        return opts
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None:
+            opts = self._orjson_opts(kwargs.get('indent'), kwargs.get('sort_keys'))
+            return orjson.dumps(obj, default=self.default, option=opts).decode()
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        # orjson returns bytes - hand them to the response without a decode/encode round trip
+        body = orjson.dumps(obj, default=self.default, option=self._orjson_opts(indent=pretty))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+def init_app(app):
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
+    return app.json
@@ -0,0 +1,146 @@
+"""
+Sales velocity and reorder forecasting.
+
+Order history is grouped per (product, day) in Mongo, then every product is
+scored at once with NumPy:
+
+    velocity       blended units/day over the 7/30/90-day windows
+    sigma          std-dev of daily demand over the longest window
+    reorder_point  velocity * lead_time + Z * sigma * sqrt(lead_time)
+    target         stock for lead_time + REVIEW_DAYS of cover plus safety stock
+
+These are written to each product's `forecast` sub-document with
+bulk_write. They depend only on order history. Anything that depends on
+the current quantity (days of cover, whether to reorder, how many) is
+worked out when /api/dashboard/reorder-report is queried, so restocking
+shows up at once.
+"""
+from pymongo import UpdateOne
+from datetime import datetime, timedelta
+import numpy as np
+import database
+import os, time
+
+WINDOWS        = (7, 30, 90)            # days
+WEIGHTS        = (0.5, 0.3, 0.2)        # recent demand counts most
+LEAD_TIME_DAYS = float(os.environ.get('REORDER_LEAD_TIME_DAYS', 14))
+REVIEW_DAYS    = float(os.environ.get('REORDER_REVIEW_DAYS', 14))
+SERVICE_Z      = float(os.environ.get('REORDER_SERVICE_Z', 1.65))   # ~95% service level
+WRITE_BATCH    = 1000
+RUN_EVERY      = 24 * 3600
+
+def compute(lead_time, order_idx, order_age, order_qty,
+            windows=WINDOWS, weights=WEIGHTS, z=SERVICE_Z, review_days=REVIEW_DAYS):
+    """
+    lead_time                 per product, shape (n,)
+    order_idx, order_age,     one row per (product, day) with sales: product
+    order_qty                 index, age in whole days (0 = today), units sold
+    Returns a dict of (n,) arrays.
+    """
+    n = len(lead_time)
+    lead_time = np.asarray(lead_time, dtype=np.float64)
+
+    velocity = np.zeros(n)
+    for w, weight in zip(windows, weights):
+        m = order_age < w
+        velocity += weight * np.bincount(order_idx[m], weights=order_qty[m], minlength=n) / w
+
+    # daily demand variance over the longest window; days without sales count as 0
+    w = max(windows)
+    m = order_age < w
+    total = np.bincount(order_idx[m], weights=order_qty[m], minlength=n)
+    sumsq = np.bincount(order_idx[m], weights=order_qty[m] ** 2, minlength=n)
+    mean  = total / w
+    sigma = np.sqrt(np.maximum(sumsq / w - mean ** 2, 0))
+
+    safety        = z * sigma * np.sqrt(lead_time)
+    reorder_point = velocity * lead_time + safety
+    target        = velocity * (lead_time + review_days) + safety
+
+    return {
+        'velocity':      velocity,
+        'sigma':         sigma,
+        'reorder_point': reorder_point,
+        'target':        target,
+    }
+
+def _load_products():
+    oids, lead, had = [], [], []
+    for p in database.db.products.find({}, {'lead_time_days': 1, 'forecast.velocity': 1}):
+        oids.append(p['_id'])
+        lead.append(p.get('lead_time_days') or LEAD_TIME_DAYS)
+        had.append(bool(p.get('forecast', {}).get('velocity')))
+    ids = np.array([o.binary for o in oids], dtype='S12')
+    return oids, ids, np.array(lead, dtype=np.float64), np.array(had, dtype=bool)
+
+def _load_sales(now):
+    since = now - timedelta(days=max(WINDOWS))
+    pipeline = [
+        {'$match': {'created_at': {'$gte': since}, 'product_id': {'$type': 'objectId'}}},
+        {'$group': {
+            '_id': {'p': '$product_id',
+                    'd': {'$floor': {'$divide': [{'$subtract': [now, '$created_at']}, 86400000]}}},
+            'q': {'$sum': '$quantity_sold'}
+        }},
+    ]
+    pids, ages, qtys = [], [], []
+    # the archive only matters if ORDER_ARCHIVE_DAYS is shorter than the window
+    for coll in (database.db.orders, database.db.orders_archive):
+        for row in coll.aggregate(pipeline, allowDiskUse=True):
+            pids.append(row['_id']['p'].binary)
+            ages.append(row['_id']['d'])
+            qtys.append(row['q'])
+    return (np.array(pids, dtype='S12'), np.array(ages, dtype=np.int64),
+            np.array(qtys, dtype=np.float64))
+
+def _index(product_ids, order_pids):
+    # map order product ids onto product rows; orders of deleted products are dropped
+    order = np.argsort(product_ids)
+    pos   = np.searchsorted(product_ids, order_pids, sorter=order)
+    pos   = np.minimum(pos, len(product_ids) - 1)
+    idx   = order[pos]
+    return idx, product_ids[idx] == order_pids
+
+def _updates(oids, r, had, now):
+    # only touch products that sell now or sold before - the rest keep no forecast
+    rows = np.flatnonzero((r['velocity'] > 0) | had)
+    cols = zip(
+        rows.tolist(),
+        np.round(r['velocity'][rows], 4).tolist(),
+        np.round(r['sigma'][rows], 4).tolist(),
+        np.round(r['reorder_point'][rows], 2).tolist(),
+        np.round(r['target'][rows], 2).tolist(),
+    )
+    return [UpdateOne({'_id': oids[i]}, {'$set': {'forecast': {
+        'velocity':      vel,
+        'sigma':         sigma,
+        'reorder_point': rop,
+        'target':        target,
+        'computed_at':   now,
+    }}}) for i, vel, sigma, rop, target in cols]
+
+def run(timings=None):
+    """Recompute all forecasts. Pass a dict as `timings` to get per-phase seconds."""
+    t = time.perf_counter()
+    def lap(phase):
+        nonlocal t
+        if timings is not None:
+            timings[phase] = time.perf_counter() - t
+        t = time.perf_counter()
+
+    now = datetime.utcnow()
+    oids, ids, lead, had = _load_products()
+    lap('load products')
+    if not oids:
+        return 0
+    order_pids, ages, qtys = _load_sales(now)
+    lap('load sales')
+    idx, found = _index(ids, order_pids)
+    r = compute(lead, idx[found], ages[found], qtys[found])
+    ops = _updates(oids, r, had, now)
+    lap('compute')
+    for i in range(0, len(ops), WRITE_BATCH):
+        database.db.products.bulk_write(ops[i:i + WRITE_BATCH], ordered=False)
+    lap('bulk_write')
+    print(f"Forecast updated for {len(ops)} products")
+    return len(ops)
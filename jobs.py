@@ -0,0 +1,176 @@
+"""
+Small durable job queue backed by the `jobs` collection.
+
+Routes call enqueue() and return immediately; a pool of worker threads
+(or processes) claims jobs with find_one_and_update, runs the registered
+handler and marks it done. Failed jobs are retried with exponential
+backoff until max_attempts. A claimed job is invisible to other workers
+until `visible_until`; if its worker dies the job becomes claimable again.
+No external broker - Mongo is the queue.
+"""
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime, timedelta
+import database
+import os, random, socket, threading, traceback, uuid, importlib
+
+HANDLERS = {}
+
+POLL_INTERVAL      = float(os.environ.get('JOB_POLL_INTERVAL', 1.0))
+VISIBILITY_TIMEOUT = int(os.environ.get('JOB_VISIBILITY_TIMEOUT', 300))
+MAX_ATTEMPTS       = int(os.environ.get('JOB_MAX_ATTEMPTS', 5))
+BACKOFF_BASE       = float(os.environ.get('JOB_BACKOFF_BASE', 5))
+BACKOFF_MAX        = float(os.environ.get('JOB_BACKOFF_MAX', 3600))
+
+# modules that register handlers; imported by worker processes on start
+HANDLER_MODULES = ['tasks']
+
+def job(name):
+    def register(f):
+        HANDLERS[name] = f
+        return f
+    return register
+
+# ─── Producer side ───────────────────────────────────────────────────────────
+def enqueue(name, payload=None, delay=0, max_attempts=None, unique=None, timeout=None):
+    """
+    Queue `name` to run with `payload` (a dict) after `delay` seconds.
+    With `unique`, at most one queued job per key exists - repeated calls
+    while it is still waiting are no-ops (used for "recompute X" jobs).
+    Returns the job id, or None when deduplicated.
+    """
+    now = datetime.utcnow()
+    doc = {
+        'name':         name,
+        'payload':      payload or {},
+        'status':       'queued',
+        'run_at':       now + timedelta(seconds=delay),
+        'attempts':     0,
+        'max_attempts': max_attempts or MAX_ATTEMPTS,
+        'timeout':      timeout or VISIBILITY_TIMEOUT,
+        'created_at':   now,
+    }
+    if not unique:
+        return database.db.jobs.insert_one(doc).inserted_id
+    doc['unique'] = unique
+    try:
+        return database.db.jobs.insert_one(doc).inserted_id
+    except DuplicateKeyError:
+        return None
+
+# ─── Consumer side ───────────────────────────────────────────────────────────
+def claim(worker_id):
+    now = datetime.utcnow()
+    # visible_until is part of the claim itself, so a worker dying right after
+    # claiming still leaves a job that times out and becomes claimable again
+    j = database.db.jobs.find_one_and_update(
+        {'$or': [
+            {'status': 'queued',  'run_at': {'$lte': now}},
+            {'status': 'running', 'visible_until': {'$lt': now}},   # worker died / timed out
+        ]},
+        {'$set': {'status': 'running', 'locked_by': worker_id, 'started_at': now,
+                  'visible_until': now + timedelta(seconds=VISIBILITY_TIMEOUT)},
+         '$inc': {'attempts': 1}},
+        sort=[('run_at', 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+    if j and j.get('timeout', VISIBILITY_TIMEOUT) != VISIBILITY_TIMEOUT:
+        # per-job timeout; until this lands the default one applies
+        j['visible_until'] = now + timedelta(seconds=j['timeout'])
+        database.db.jobs.update_one({'_id': j['_id'], 'locked_by': worker_id},
+                                    {'$set': {'visible_until': j['visible_until']}})
+    return j
+
+def _finish(j, worker_id, upd):
+    # only the current owner may finish - a timed-out worker must not clobber a re-claim
+    database.db.jobs.update_one({'_id': j['_id'], 'locked_by': worker_id},
+                                {'$set': upd, '$unset': {'visible_until': ''}})
+
+def backoff(attempts):
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+def run_one(j, worker_id):
+    handler = HANDLERS.get(j['name'])
+    try:
+        if handler is None:
+            raise LookupError(f"No handler for job '{j['name']}'")
+        if j['attempts'] > j.get('max_attempts', MAX_ATTEMPTS):
+            raise RuntimeError('Visibility timeout exceeded on last attempt')
+        handler(**j.get('payload', {}))
+    except Exception as e:
+        err = f"{type(e).__name__}: {e}"
+        if handler is not None and j['attempts'] < j.get('max_attempts', MAX_ATTEMPTS):
+            try:
+                _finish(j, worker_id, {
+                    'status': 'queued', 'error': err,
+                    # from the failure, not the claim - a long run must not retry at once
+                    'run_at': datetime.utcnow() + timedelta(seconds=backoff(j['attempts'])),
+                })
+            except DuplicateKeyError:
+                # a copy with the same unique key was queued meanwhile and will do the work
+                _finish(j, worker_id, {'status': 'done', 'error': err, 'superseded': True,
+                                       'finished_at': datetime.utcnow()})
+        else:
+            _finish(j, worker_id, {'status': 'failed', 'error': err,
+                                   'trace': traceback.format_exc()[-2000:],
+                                   'finished_at': datetime.utcnow()})
+            print(f"Job {j['name']} {j['_id']} failed: {err}")
+        return False
+    _finish(j, worker_id, {'status': 'done', 'finished_at': datetime.utcnow()})
+    return True
+
+def work(stop, worker_id=None):
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+    while not stop.is_set():
+        try:
+            j = claim(worker_id)
+        except Exception as e:
+            print(f"Job claim error: {str(e)[:80]}")
+            j = None
+        if j is None:
+            stop.wait(POLL_INTERVAL)
+            continue
+        try:
+            run_one(j, worker_id)
+        except Exception as e:
+            # keep the worker alive; the job is reclaimed once visible_until passes
+            print(f"Job {j['name']} {j['_id']} error: {str(e)[:80]}")
+
+def _process_main(uri, stop):
+    database.init_db(uri)
+    for m in HANDLER_MODULES:
+        importlib.import_module(m)
+    work(stop)
+
+# ─── Pool ────────────────────────────────────────────────────────────────────
+class WorkerPool:
+    def __init__(self, workers, stop):
+        self.workers = workers
+        self.stop    = stop
+
+    def shutdown(self, timeout=10):
+        self.stop.set()
+        for w in self.workers:
+            w.join(timeout)
+
+def start_workers(count=2, mode='thread', uri=None):
+    """
+    Start `count` workers. mode='thread' shares this process's client;
+    mode='process' forks processes that open their own connection to `uri`.
+    """
+    if mode == 'process':
+        import multiprocessing
+        # fork, not spawn: spawn re-imports app.py, which would start workers again
+        ctx  = multiprocessing.get_context('fork')
+        stop = ctx.Event()
+        workers = [ctx.Process(target=_process_main, args=(uri, stop), daemon=True,
+                               name=f"job-worker-{i}") for i in range(count)]
+    else:
+        stop = threading.Event()
+        workers = [threading.Thread(target=work, args=(stop,), daemon=True,
+                                    name=f"job-worker-{i}") for i in range(count)]
+    for w in workers:
+        w.start()
+    print(f"Job workers started: {count} ({mode})")
+    return WorkerPool(workers, stop)
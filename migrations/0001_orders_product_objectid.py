@@ -0,0 +1,55 @@
+"""
+orders.product_id: str -> ObjectId, drop the denormalized
+product_title / product_image copies (now joined with $lookup),
+replace the product_id index with (product_id, created_at).
+
+Only orders whose product still exists are rewritten. Orders with an
+invalid id or a deleted product keep their original product_id and
+copied title/image, since those are the only record of what was sold.
+"""
+from pymongo import UpdateOne
+from bson import ObjectId
+
+BATCH = 1000
+
+def up(db):
+    query = {'$or': [
+        {'product_id': {'$type': 'string'}},
+        {'product_title': {'$exists': True}},
+        {'product_image': {'$exists': True}},
+    ]}
+    last, converted, skipped = None, 0, 0
+    while True:
+        q = query if last is None else {'$and': [query, {'_id': {'$gt': last}}]}
+        batch = list(db.orders.find(q, {'product_id': 1}).sort('_id', 1).limit(BATCH))
+        if not batch:
+            break
+        last = batch[-1]['_id']
+
+        pids = {}
+        for o in batch:
+            pid = o.get('product_id')
+            if isinstance(pid, str) and ObjectId.is_valid(pid):
+                pid = ObjectId(pid)
+            pids[o['_id']] = pid
+        wanted   = [p for p in pids.values() if isinstance(p, ObjectId)]
+        existing = {p['_id'] for p in db.products.find({'_id': {'$in': wanted}}, {'_id': 1})}
+
+        ops = []
+        for oid, pid in pids.items():
+            if pid in existing:
+                ops.append(UpdateOne({'_id': oid}, {
+                    '$set':   {'product_id': pid},
+                    '$unset': {'product_title': '', 'product_image': ''}
+                }))
+            else:
+                skipped += 1
+        if ops:
+            db.orders.bulk_write(ops, ordered=False)
+            converted += len(ops)
+
+    print(f"Orders migrated: {converted}, left unchanged (invalid id or missing product): {skipped}")
+
+    db.orders.create_index([('product_id', 1), ('created_at', -1)])
+    if 'product_id_1' in db.orders.index_information():
+        db.orders.drop_index('product_id_1')   # prefix of the compound index
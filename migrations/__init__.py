@@ -0,0 +1,38 @@
+"""
+Versioned schema migrations.
+
+Each module in this package named NNNN_description.py defines up(db).
+run() applies the ones not yet recorded in `schema_migrations`, in
+version order, once per database. Migrations must be safe to re-run
+if they die halfway (work in batches, filter on the old shape).
+"""
+from datetime import datetime
+import importlib, os, re
+
+_PATTERN = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+def available():
+    out = []
+    for fn in os.listdir(os.path.dirname(__file__)):
+        m = _PATTERN.match(fn)
+        if m:
+            out.append((m.group(1), m.group(2)))
+    return sorted(out)
+
+def applied(db):
+    return {m['_id'] for m in db.schema_migrations.find({}, {'_id': 1})}
+
+def run(db):
+    done = applied(db)
+    for version, name in available():
+        if version in done:
+            continue
+        print(f"Migrating {version}_{name}...")
+        module = importlib.import_module(f"{__name__}.{version}_{name}")
+        module.up(db)
+        db.schema_migrations.insert_one({
+            '_id':        version,
+            'name':       name,
+            'applied_at': datetime.utcnow()
+        })
+    print("Migrations up to date")
@@ -1,7 +1,9 @@
-from flask import Blueprint, jsonify, session
-import database
+from flask import Blueprint, request, jsonify, session
+import database, admission
 from datetime import datetime, timedelta
 from functools import wraps
+import math
+from routes.orders import PRODUCT_LOOKUP, serialize as serialize_order
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
@@ -13,11 +15,13 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated
 
-@dashboard_bp.route('/stats', methods=['GET'])
-@login_required
-def stats():
+STATS_MAX_AGE = 300    # seconds a cached counter set is served before recomputing inline
+
+def compute_counters():
     total_products  = database.db.products.count_documents({})
-    total_orders    = database.db.orders.count_documents({})
+    # collection metadata, O(1) regardless of history size
+    total_orders    = (database.db.orders.estimated_document_count() +
+                       database.db.orders_archive.estimated_document_count())
     out_of_stock    = database.db.products.count_documents({'quantity': 0})
 
     # Low stock (qty > 0 but <= threshold)
@@ -30,10 +34,42 @@ def stats():
     val = list(database.db.products.aggregate(pipeline))
     total_value = val[0]['value'] if val else 0
 
-    # Recent orders (last 7 days)
+    # Recent orders (last 7 days) - always in the hot tier, see archive.py
     week_ago = datetime.utcnow() - timedelta(days=7)
     recent_order_count = database.db.orders.count_documents({'created_at': {'$gte': week_ago}})
 
+    return {
+        'total_products': total_products,
+        'total_orders': total_orders,
+        'out_of_stock': out_of_stock,
+        'low_stock': low_stock,
+        'total_value': round(total_value, 2),
+        'recent_orders_7d': recent_order_count,
+    }
+
+def refresh_counters():
+    counters = compute_counters()
+    database.db.stats_cache.replace_one(
+        {'_id': 'dashboard'},
+        {'_id': 'dashboard', 'counters': counters, 'computed_at': datetime.utcnow()},
+        upsert=True
+    )
+    return counters
+
+def get_counters():
+    # Kept fresh by the refresh_stats job that writes enqueue; falls back to inline
+    cached = database.db.stats_cache.find_one({'_id': 'dashboard'})
+    if cached and cached['computed_at'] > datetime.utcnow() - timedelta(seconds=STATS_MAX_AGE):
+        return cached['counters']
+    return refresh_counters()
+
+@dashboard_bp.route('/stats', methods=['GET'])
+@login_required
+@admission.rate_limit('stats', rate=1, burst=5)
+@admission.limit('stats', 2)
+def stats():
+    counters = get_counters()
+
     # Recent products
     recent_products = list(database.db.products.find()
         .sort('created_at', -1).limit(5))
@@ -71,29 +107,55 @@ def stats():
     } for p in oos_list]
 
     # Recent orders
-    recent_orders = list(database.db.orders.find().sort('created_at', -1).limit(5))
+    recent_orders = list(database.db.orders.aggregate([
+        {'$sort':  {'created_at': -1}},
+        {'$limit': 5},
+        PRODUCT_LOOKUP,
+    ]))
     r_orders = [{
-        '_id':           str(o['_id']),
-        'product_title': o.get('product_title', ''),
-        'product_image': o.get('product_image', ''),
-        'quantity_sold': o.get('quantity_sold', 1),
-        'sale_price':    o.get('sale_price', 0),
-        'account':       o.get('account', ''),
-        'created_at':    o.get('created_at', datetime.utcnow()).isoformat()
-    } for o in recent_orders]
+        k: order[k] for k in ('_id', 'product_title', 'product_image', 'quantity_sold',
+                              'sale_price', 'account', 'created_at')
+    } for order in map(serialize_order, recent_orders)]
 
     return jsonify({
         'success': True,
-        'stats': {
-            'total_products': total_products,
-            'total_orders': total_orders,
-            'out_of_stock': out_of_stock,
-            'low_stock': low_stock,
-            'total_value': round(total_value, 2),
-            'recent_orders_7d': recent_order_count,
-        },
+        'stats': counters,
         'recent_products': recent_list,
         'low_stock_list': low_list,
         'out_of_stock_list': oos,
         'recent_orders': r_orders
     })
+
+# ─── Reorder report (see forecast.py) ────────────────────────────────────────
+@dashboard_bp.route('/reorder-report', methods=['GET'])
+@login_required
+@admission.rate_limit('reorder', rate=1, burst=5)
+@admission.limit('reorder', 2)
+def reorder_report():
+    limit = min(max(1, int(request.args.get('limit', 50))), admission.MAX_PER_PAGE)
+    # judged against the live quantity, so a restock drops off straight away
+    items = list(database.db.products.aggregate([
+        {'$match': {
+            'forecast.velocity': {'$gt': 0},
+            '$expr': {'$lte': [{'$ifNull': ['$quantity', 0]}, '$forecast.reorder_point']}
+        }},
+        {'$project': {'title': 1, 'part_number': 1, 'quantity': 1, 'images': 1, 'forecast': 1,
+                      'days_of_cover': {'$divide': [{'$ifNull': ['$quantity', 0]}, '$forecast.velocity']}}},
+        {'$sort':  {'days_of_cover': 1}},
+        {'$limit': limit},
+    ]))
+    return jsonify({
+        'success': True,
+        'products': [{
+            '_id':           str(p['_id']),
+            'title':         p.get('title', ''),
+            'part_number':   p.get('part_number', ''),
+            'quantity':      p.get('quantity', 0),
+            'image':         (p.get('images') or [''])[0],
+            'velocity':      p['forecast'].get('velocity', 0),
+            'days_of_cover': round(p['days_of_cover'], 1),
+            'reorder_point': p['forecast'].get('reorder_point', 0),
+            'suggested_qty': max(0, math.ceil(p['forecast'].get('target', 0) - p.get('quantity', 0))),
+            'computed_at':   p['forecast'].get('computed_at'),
+        } for p in items]
+    })
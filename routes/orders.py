@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify, session
-import database
+import database, jobs, admission
 from datetime import datetime
 from bson import ObjectId
 from functools import wraps
@@ -14,12 +14,25 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated
 
+# Joins each order to its product; title/image are read live instead of
+# being copied into the order at write time. Only those two fields are
+# joined, not the whole product document.
+PRODUCT_LOOKUP = {'$lookup': {
+    'from':         'products',
+    'localField':   'product_id',
+    'foreignField': '_id',
+    'pipeline':     [{'$project': {'title': 1, 'images': {'$slice': ['$images', 1]}}}],
+    'as':           'product'
+}}
+
 def serialize(o):
+    product = (o.get('product') or [{}])[0]
     return {
         '_id':        str(o['_id']),
-        'product_id': o.get('product_id', ''),
-        'product_title': o.get('product_title', ''),
-        'product_image': o.get('product_image', ''),
+        'product_id': str(o.get('product_id') or ''),
+        # legacy orders the migration could not link keep their copied fields
+        'product_title': product.get('title', o.get('product_title', '')),
+        'product_image': (product.get('images') or [o.get('product_image', '')])[0],
         'quantity_sold': o.get('quantity_sold', 1),
         'sale_price':   o.get('sale_price', 0),
         'account':      o.get('account', ''),        # PMC / Powergen
@@ -27,7 +40,7 @@ def serialize(o):
         'buyer_name':   o.get('buyer_name', ''),
         'note':         o.get('note', ''),
         'added_by':     o.get('added_by', ''),
-        'created_at':   o.get('created_at', datetime.utcnow()).isoformat(),
+        'created_at':   o.get('created_at', datetime.utcnow()),
     }
 
 # ─── Add order (manually) ─────────────────────────────────────────────────────
@@ -55,9 +68,7 @@ def add_order():
 
     # Insert order
     order_id = database.db.orders.insert_one({
-        'product_id':    pid,
-        'product_title': product.get('title', ''),
-        'product_image': (product.get('images') or [''])[0],
+        'product_id':    product['_id'],
         'quantity_sold': qty,
         'sale_price':    float(data.get('sale_price', product.get('price', 0))),
         'account':       data.get('account', ''),
@@ -74,6 +85,7 @@ def add_order():
         {'$set': {'quantity': new_qty, 'updated_at': datetime.utcnow()},
          '$inc': {'total_sold': qty}}
     )
+    jobs.enqueue('refresh_stats', unique='refresh_stats')
 
     return jsonify({
         'success':      True,
@@ -82,22 +94,43 @@ def add_order():
         'qty_reduced':  qty
     })
 
+def _page(coll, query, skip, limit):
+    return list(coll.aggregate([
+        {'$match': query},
+        {'$sort':  {'created_at': -1}},
+        {'$skip':  skip},
+        {'$limit': limit},
+        PRODUCT_LOOKUP,
+    ]))
+
 # ─── List orders ───────────────────────────────────────────────────────────────
 @orders_bp.route('/list', methods=['GET'])
 @login_required
+@admission.rate_limit('orders', rate=5, burst=20)
+@admission.limit('orders', 4)
 def list_orders():
     pid      = request.args.get('product_id')
-    page     = int(request.args.get('page', 1))
-    per_page = int(request.args.get('per_page', 20))
+    page, per_page = admission.page_args()
+    archived = request.args.get('archived', '').lower() in ('1', 'true', 'yes')
 
     query = {}
-    if pid: query['product_id'] = pid
+    if pid:
+        try:
+            query['product_id'] = ObjectId(pid)
+        except:
+            return jsonify({'error': 'Invalid product id'}), 400
 
     total  = database.db.orders.count_documents(query)
-    orders = list(database.db.orders.find(query)
-        .sort('created_at', -1)
-        .skip((page - 1) * per_page)
-        .limit(per_page))
+    skip   = (page - 1) * per_page
+    orders = _page(database.db.orders, query, skip, per_page) if skip < total else []
+
+    # Older orders live in orders_archive and are all older than the hot
+    # tier, so the archive simply continues where the hot tier ends
+    if archived:
+        if len(orders) < per_page:
+            orders += _page(database.db.orders_archive, query,
+                            max(0, skip - total), per_page - len(orders))
+        total += database.db.orders_archive.count_documents(query)
 
     return jsonify({
         'success': True,
@@ -109,21 +142,24 @@ def list_orders():
 @orders_bp.route('/<oid>', methods=['DELETE'])
 @login_required
 def delete_order(oid):
-    order = database.db.orders.find_one({'_id': ObjectId(oid)})
+    coll  = database.db.orders
+    order = coll.find_one({'_id': ObjectId(oid)})
+    if not order:
+        coll  = database.db.orders_archive
+        order = coll.find_one({'_id': ObjectId(oid)})
     if not order:
         return jsonify({'error': 'Not found'}), 404
 
     qty = order.get('quantity_sold', 1)
-    pid = order.get('product_id', '')
 
     # Restore quantity
-    try:
+    if order.get('product_id'):
         database.db.products.update_one(
-            {'_id': ObjectId(pid)},
+            {'_id': order['product_id']},
             {'$inc': {'quantity': qty, 'total_sold': -qty},
              '$set': {'updated_at': datetime.utcnow()}}
         )
-    except: pass
 
-    database.db.orders.delete_one({'_id': ObjectId(oid)})
+    coll.delete_one({'_id': order['_id']})
+    jobs.enqueue('refresh_stats', unique='refresh_stats')
     return jsonify({'success': True, 'qty_restored': qty})
@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify, session, current_app
-import database
+import database, jobs, admission
 from datetime import datetime
 from bson import ObjectId
 from functools import wraps
@@ -55,17 +55,18 @@ def serialize(p, include_links=True):
         'link_count':   len(links),
         'is_group':     len(links) > 1,
         'total_sold':   p.get('total_sold', 0),
-        'created_at':   p.get('created_at', datetime.utcnow()).isoformat(),
-        'updated_at':   p.get('updated_at', datetime.utcnow()).isoformat(),
+        'created_at':   p.get('created_at', datetime.utcnow()),
+        'updated_at':   p.get('updated_at', datetime.utcnow()),
     }
 
 # ─── Search / List ───────────────────────────────────────────────────────────
 @products_bp.route('/search', methods=['GET'])
 @login_required
+@admission.rate_limit('search', rate=5, burst=20)
+@admission.limit('search', 4)
 def search():
     q = request.args.get('q', '').strip()
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('per_page', 20))
+    page, per_page = admission.page_args()
 
     if q:
         query = {'$text': {'$search': q}}
@@ -190,6 +191,7 @@ def add_product():
     }
 
     pid = database.db.products.insert_one(doc).inserted_id
+    jobs.enqueue('refresh_stats', unique='refresh_stats')
     return jsonify({'success': True, 'product_id': str(pid)})
 
 # ─── Get single product ───────────────────────────────────────────────────────
@@ -267,8 +269,15 @@ def update_product(pid):
 
             upd['images']          = remaining_images
             upd['location_images'] = remaining_loc
+
+            # Files the user removed are cleaned up in the background
+            old = database.db.products.find_one({'_id': ObjectId(pid)},
+                                                {'images': 1, 'location_images': 1}) or {}
+            kept = set(remaining_images) | set(remaining_loc)
+            removed = [u for u in old.get('images', []) + old.get('location_images', []) if u not in kept]
         else:
             data = request.get_json()
+            removed = []
             upd = {'updated_at': datetime.utcnow()}
             for field in ['title','part_name','part_number','side','color','tags','car_make','car_model',
                           'car_year','description','price','shipping','quantity',
@@ -277,6 +286,10 @@ def update_product(pid):
                     upd[field] = data[field]
 
         database.db.products.update_one({'_id': ObjectId(pid)}, {'$set': upd})
+        # only once the product no longer points at them
+        if removed:
+            jobs.enqueue('delete_files', {'urls': removed})
+        jobs.enqueue('refresh_stats', unique='refresh_stats')
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -291,6 +304,7 @@ def update_quantity(pid):
         {'_id': ObjectId(pid)},
         {'$set': {'quantity': qty, 'updated_at': datetime.utcnow()}}
     )
+    jobs.enqueue('refresh_stats', unique='refresh_stats')
     return jsonify({'success': True, 'quantity': qty})
 
 # ─── Add eBay link to existing product ───────────────────────────────────────
@@ -328,6 +342,12 @@ def remove_link(pid):
 @products_bp.route('/<pid>', methods=['DELETE'])
 @login_required
 def delete_product(pid):
-    database.db.products.delete_one({'_id': ObjectId(pid)})
-    database.db.orders.delete_many({'product_id': pid})
+    p = database.db.products.find_one_and_delete({'_id': ObjectId(pid)},
+                                                 {'images': 1, 'location_images': 1})
+    if not p:
+        return jsonify({'error': 'Not found'}), 404
+    # Order history and image files can be large - clean up off the request
+    jobs.enqueue('delete_product_orders', {'product_id': pid})
+    jobs.enqueue('delete_files', {'urls': p.get('images', []) + p.get('location_images', [])})
+    jobs.enqueue('refresh_stats', unique='refresh_stats')
     return jsonify({'success': True})
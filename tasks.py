@@ -0,0 +1,43 @@
+"""
+Background job handlers. Registered on import; see jobs.py.
+"""
+from jobs import job, enqueue
+import database, archive, forecast
+from bson import ObjectId
+import os
+
+UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'static', 'uploads')
+
+@job('delete_files')
+def delete_files(urls):
+    # urls look like /static/uploads/<uuid>.<ext> (see save_image)
+    for url in urls or []:
+        if not url or not url.startswith('/static/uploads/'):
+            continue
+        path = os.path.join(UPLOAD_FOLDER, os.path.basename(url))
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+@job('delete_product_orders')
+def delete_product_orders(product_id):
+    database.db.orders.delete_many({'product_id': ObjectId(product_id)})
+    database.db.orders_archive.delete_many({'product_id': ObjectId(product_id)})
+    enqueue('refresh_stats', unique='refresh_stats')
+
+@job('refresh_stats')
+def refresh_stats():
+    from routes.dashboard import refresh_counters
+    refresh_counters()
+
+@job('archive_orders')
+def archive_orders():
+    archive.archive_orders()
+    # self-scheduling; `unique` keeps a single pending run
+    enqueue('archive_orders', delay=archive.RUN_EVERY, unique='archive_orders')
+
+@job('recompute_forecast')
+def recompute_forecast():
+    forecast.run()
+    enqueue('recompute_forecast', delay=forecast.RUN_EVERY, unique='recompute_forecast')